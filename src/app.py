@@ -1,15 +1,76 @@
+import asyncio
+import bisect
 import gradio as gr
 import joblib
-import pandas as pd
-import json
+import numpy as np
+import warnings
+from collections import OrderedDict
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
 
-# 1. Load the exported artifacts
-model_pipeline = joblib.load('./models/logistic_regression_pipeline.joblib')
-encoders = joblib.load('./models/label_encoders.joblib')
-with open('feature_metadata.json', 'r') as f:
-    metadata = json.load(f)
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
-feature_names = metadata['feature_names']
+# 1. Load the exported artifacts (skipped on `gradio app.py` hot reloads)
+if gr.NO_RELOAD:
+    model_pipeline = joblib.load('./models/logistic_regression_pipeline.joblib')
+    encoders = joblib.load('./models/label_encoders.joblib')
+    with open('./models/feature_metadata.json', 'rb') as f:
+        metadata = json_loads(f.read())
+
+    feature_names = metadata['feature_names']
+
+    # Keep the fitted statistics and weights in float32 to match the float32 input row
+    for _step in model_pipeline.named_steps.values():
+        for _attr in ('mean_', 'var_', 'scale_', 'coef_', 'intercept_'):
+            if isinstance(getattr(_step, _attr, None), np.ndarray):
+                setattr(_step, _attr, getattr(_step, _attr).astype(np.float32))
+
+# Column positions and label-encoder outputs, precomputed for the request path
+col_index = {name: i for i, name in enumerate(feature_names)}
+binary_codes = {
+    col: {cls: i for i, cls in enumerate(encoders[col].classes_)}
+    for col in ['Gender', 'Have you ever had suicidal thoughts ?', 'Family History of Mental Illness']
+}
+
+# Every one-hot column the model knows, grouped by source column,
+# e.g. onehot_index['Sleep Duration']['7-8 hours'] -> column position
+onehot_index = {}
+for name, i in col_index.items():
+    prefix, sep, value = name.partition('_')
+    if sep:
+        onehot_index.setdefault(prefix, {})[value] = i
+
+# Per-input views used by the request path (baseline categories have no entry)
+status_idx = onehot_index.get('Working Professional or Student', {})
+profession_idx = onehot_index.get('Profession', {})
+sleep_idx = onehot_index.get('Sleep Duration', {})
+diet_idx = onehot_index.get('Dietary Habits', {})
+
+# Professions seen at training time, matched case-insensitively; anything else maps
+# to the "other" bucket (its own column if the model has one, otherwise no column)
+OTHER_PROFESSION = '__OTHER__'
+known_professions = {p.lower(): p for p in profession_idx}
+
+# Scaler statistics and logistic weights, so a single row can be scored without
+# going through Pipeline.predict_proba; anything but a centring and scaling
+# StandardScaler followed by a binary LogisticRegression falls back to it
+_steps = [step for _, step in getattr(model_pipeline, 'steps', [])]
+if (
+    len(_steps) == 2
+    and isinstance(_steps[0], StandardScaler) and _steps[0].with_mean and _steps[0].with_std
+    and isinstance(_steps[1], LogisticRegression)
+    and len(_steps[1].classes_) == 2 and _steps[1].coef_.shape[0] == 1
+):
+    _scaler, _lr = _steps
+    lr_mean = _scaler.mean_
+    lr_inv_scale = np.float32(1.0) / _scaler.scale_
+    lr_coef = _lr.coef_[0]
+    lr_intercept = float(_lr.intercept_[0])
+else:
+    lr_coef = None
 
 # --- MAPPING DICTIONARIES ---
 # Maps descriptive text from dropdowns to numerical values (0-5) for the ML model
@@ -27,74 +88,213 @@ financial_stress_map = {
     "1 = No Stress": 1, "2 = Low": 2, "3 = Moderate": 3, "4 = High": 4, "5 = Extreme": 5
 }
 
-def predict_depression(
+# Single lookup for every dropdown label above (the label strings never overlap)
+label_to_int = {**pressure_map, **satisfaction_map, **financial_stress_map}
+
+# Risk tiers by probability: below 0.3, below 0.7, and the rest
+risk_thresholds = (0.3, 0.7)
+risk_tiers = (
+    ("🟢 LOW RISK", "Continue your healthy habits! Regular exercise and mindfulness can maintain this state."),
+    ("🟡 MODERATE RISK", "You are showing some signs of stress. Consider a wellness check-in or guided meditation."),
+    ("🔴 HIGH RISK", "Risk detected. We recommend speaking with a mental health professional or using a support hotline."),
+)
+
+# Micro-batching of concurrent requests and result caching
+# (a batch can never exceed the number of requests Gradio runs at once)
+CONCURRENCY_LIMIT = 8
+BATCH_MAX = CONCURRENCY_LIMIT
+RESULT_CACHE_SIZE = 512
+
+# Form fields that must be answered, in predict_depression argument order
+required_fields = (
+    "Gender", "Status", "Sleep Duration", "Dietary Habits",
+    "Suicidal thoughts", "Family History of Mental Illness"
+)
+
+def _encode_row(
+    x, gender, age, status, profession, acad_press, work_press, cgpa, study_sat,
+    job_sat, sleep, diet, suicide, hours, finance_stress, family_hist
+):
+    # 2. Fill the feature row x (all zeros on entry) in training column order
+
+    x[col_index['Gender']] = binary_codes['Gender'][gender]
+    x[col_index['Age']] = age
+    x[col_index['Work/Study Hours']] = hours
+    x[col_index['Financial Stress']] = finance_stress
+    x[col_index['Have you ever had suicidal thoughts ?']] = binary_codes['Have you ever had suicidal thoughts ?'][suicide]
+    x[col_index['Family History of Mental Illness']] = binary_codes['Family History of Mental Illness'][family_hist]
+
+    if status == 'Student':
+        x[col_index['Academic Pressure']] = acad_press
+        x[col_index['CGPA']] = cgpa
+        x[col_index['Study Satisfaction']] = study_sat
+    else:
+        x[col_index['Work Pressure']] = work_press
+        x[col_index['Job Satisfaction']] = job_sat
+
+    # 3. One-hot columns (baseline categories were dropped at training time)
+    for idx in (
+        status_idx.get(status), profession_idx.get(profession),
+        sleep_idx.get(sleep), diet_idx.get(diet)
+    ):
+        if idx is not None:
+            x[idx] = 1.0
+
+    # Reject values the model cannot score, so the batcher can fail this row alone
+    finite = np.isfinite(x)
+    if not finite.all():
+        raise ValueError(f"Invalid value for {feature_names[int(finite.argmin())]}")
+
+def _score(X):
+    # Depression probability for every row of X
+    if lr_coef is None:
+        # The pipeline was fitted on a DataFrame but is fed a plain row vector here
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="X does not have valid feature names")
+            return model_pipeline.predict_proba(X)[:, 1]
+    z = ((X - lr_mean) * lr_inv_scale) @ lr_coef
+    z = z.astype(np.float64) + lr_intercept
+    # Evaluate the sigmoid on the side that cannot overflow np.exp
+    e = np.exp(-np.abs(z))
+    return np.where(z >= 0, 1.0 / (1.0 + e), e / (1.0 + e))
+
+class _Batcher:
+    # Collects concurrent requests, encodes them into one matrix per batch and scores
+    # it with one _score call. The worker is (re)started on the running event loop
+    # the first time it is needed.
+
+    def __init__(self, max_size=BATCH_MAX):
+        self.max_size = max_size
+        self._loop = None
+        self._queue = None
+        self._worker = None
+
+    async def predict(self, inputs):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        future = loop.create_future()
+        await self._queue.put((inputs, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            # Let requests submitted in the same event-loop step join the batch,
+            # then score straight away instead of waiting for more to arrive
+            await asyncio.sleep(0)
+            while len(batch) < self.max_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # A row that fails to encode is cleared and its slot reused, so only
+            # that request errors and the rest of the batch is still scored
+            X = np.zeros((len(batch), len(feature_names)), dtype=np.float32)
+            futures = []
+            for inputs, future in batch:
+                x = X[len(futures)]
+                try:
+                    _encode_row(x, *inputs)
+                except Exception as e:
+                    x[:] = 0.0
+                    if not future.done():
+                        future.set_exception(e)
+                    continue
+                futures.append(future)
+            if not futures:
+                continue
+
+            try:
+                probs = _score(X[:len(futures)])
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for future, prob in zip(futures, probs):
+                if not future.done():
+                    future.set_result(float(prob))
+
+batcher = _Batcher()
+
+# Results of recent submissions, so repeats skip preprocessing and the batch queue
+_result_cache = OrderedDict()
+
+async def _predict_core(*inputs):
+    if inputs in _result_cache:
+        _result_cache.move_to_end(inputs)
+        return _result_cache[inputs]
+
+    prob = await batcher.predict(inputs)
+    prediction = int(prob > 0.5) # 0 or 1, same threshold as LogisticRegression.predict
+
+    _result_cache[inputs] = prob, prediction
+    if len(_result_cache) > RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+    return prob, prediction
+
+async def predict_depression(
     name, phone, gender, age, status, profession, acad_press_label, work_press_label, 
     cgpa, study_sat_label, job_sat_label, sleep, diet, suicide, 
     hours, finance_stress_label, family_hist
 ):
     # --- FORM VALIDATION ---
-    if not gender or not status or not sleep or not diet or not suicide or not family_hist:
-        raise gr.Error("Please fill in all required fields before submitting.")
+    missing = [
+        field for field, value in zip(required_fields, (gender, status, sleep, diet, suicide, family_hist))
+        if not value
+    ]
+    if missing:
+        raise gr.Error(f"Please fill in all required fields before submitting. Missing: {', '.join(missing)}")
+
+    if status not in ('Student', 'Working Professional'):
+        raise gr.Error(f"Unrecognised status '{status}'. Please pick Student or Working Professional.")
+
+    for col, value in (
+        ('Gender', gender),
+        ('Have you ever had suicidal thoughts ?', suicide),
+        ('Family History of Mental Illness', family_hist),
+    ):
+        if value not in binary_codes[col]:
+            raise gr.Error(f"Unrecognised answer '{value}' for {col}. Please pick one of the listed options.")
 
     # Convert descriptive labels to numerical integers for the model
-    acad_press = pressure_map.get(acad_press_label, 0)
-    work_press = pressure_map.get(work_press_label, 0)
-    study_sat = satisfaction_map.get(study_sat_label, 0)
-    job_sat = satisfaction_map.get(job_sat_label, 0)
-    finance_stress = financial_stress_map.get(finance_stress_label, 1)
-
-    # 2. Create a dictionary from inputs
-    input_data = {
-        'Gender': gender,
-        'Age': age,
-        'Working Professional or Student': status,
-        'Profession': profession if status == 'Working Professional' else 'Student',
-        'Academic Pressure': acad_press if status == 'Student' else 0,
-        'Work Pressure': work_press if status == 'Working Professional' else 0,
-        'CGPA': cgpa if status == 'Student' else 0,
-        'Study Satisfaction': study_sat if status == 'Student' else 0,
-        'Job Satisfaction': job_sat if status == 'Working Professional' else 0,
-        'Sleep Duration': sleep,
-        'Dietary Habits': diet,
-        'Have you ever had suicidal thoughts ?': suicide,
-        'Work/Study Hours': hours,
-        'Financial Stress': finance_stress,
-        'Family History of Mental Illness': family_hist
-    }
+    # (done before the cached call so the cache key is the integers, not the labels)
+    acad_press = label_to_int.get(acad_press_label, 0)
+    work_press = label_to_int.get(work_press_label, 0)
+    study_sat = label_to_int.get(study_sat_label, 0)
+    job_sat = label_to_int.get(job_sat_label, 0)
+    finance_stress = label_to_int.get(finance_stress_label, 1)
+
+    # Blank numeric fields count as 0, as they did when the row was built with pandas
+    age = age or 0
+    cgpa = cgpa or 0
+    hours = hours or 0
+
+    # Zero the answers the model ignores for this status (as _encode_row does), so
+    # submissions that only differ in those fields share one cache entry
+    if status == 'Student':
+        profession = 'Student'
+        work_press = job_sat = 0
+    else:
+        profession = known_professions.get((profession or '').strip().lower(), OTHER_PROFESSION)
+        if profession == OTHER_PROFESSION:
+            gr.Warning("Profession not recognised by the model; the assessment ignores it.")
+        acad_press = cgpa = study_sat = 0
 
     try:
-        # 3. Preprocess and Align
-        df_input = pd.DataFrame([input_data])
-        
-        for col in ['Gender', 'Have you ever had suicidal thoughts ?', 'Family History of Mental Illness']:
-            df_input[col] = encoders[col].transform(df_input[col].astype(str))
-        
-        df_encoded = pd.get_dummies(df_input)
-        
-        for col in feature_names:
-            if col not in df_encoded.columns:
-                df_encoded[col] = 0
-        df_final = df_encoded[feature_names]
-
-        # 4. Predict Probability and Binary Class
-        prob = model_pipeline.predict_proba(df_final)[0][1]
-        prediction = model_pipeline.predict(df_final)[0] # 0 or 1
+        prob, prediction = await _predict_core(
+            gender, age, status, profession, acad_press, work_press, cgpa, study_sat,
+            job_sat, sleep, diet, suicide, hours, finance_stress, family_hist
+        )
         
         # Determine Status string
         status_text = "Positive" if prediction == 1 else "Negative"
         
         # 5. Intervention Logic
-        if prob < 0.3:
-            level, color = "LOW RISK", "🟢"
-            advice = "Continue your healthy habits! Regular exercise and mindfulness can maintain this state."
-        elif prob < 0.7:
-            level, color = "MODERATE RISK", "🟡"
-            advice = "You are showing some signs of stress. Consider a wellness check-in or guided meditation."
-        else:
-            level, color = "HIGH RISK", "🔴"
-            advice = "Risk detected. We recommend speaking with a mental health professional or using a support hotline."
-
-        return status_text, f"{color} {level}", f"{prob:.2%}", advice
+        assessment, advice = risk_tiers[bisect.bisect_right(risk_thresholds, prob)]
+
+        return status_text, assessment, f"{prob:.2%}", advice
 
     except Exception as e:
         raise gr.Error(f"An error occurred during prediction: {str(e)}")
@@ -132,9 +332,12 @@ interface = gr.Interface(
         gr.Textbox(label="Risk Probability"),
         gr.Textbox(label="Recommendation")
     ],
+    cache_examples="lazy",       # evaluate examples on first use, not at launch
+    delete_cache=(3600, 3600),   # purge cached session files older than an hour, hourly
     title="AI Depression Risk Screener",
     description="Welcome to a secure, AI-powered platform designed to assess depression risk using validated lifestyle and behavioral indicators. \n\n Your privacy is our priority. All information provided is handled securely, anonymized, and never shared with third parties. \n\n By using this platform, you provide informed consent for your data to be processed solely for depression risk prediction and research-driven improvement of the system."
 )
 
 if __name__ == "__main__":
-    interface.launch(server_name="0.0.0.0", server_port=7860)
\ No newline at end of file
+    # Model state is module-level and read-only, so requests can run concurrently
+    interface.queue(default_concurrency_limit=CONCURRENCY_LIMIT, max_size=64).launch(server_name="0.0.0.0", server_port=7860)
\ No newline at end of file
@@ -0,0 +1,138 @@
+import asyncio
+import math
+import os
+import random
+
+import joblib
+import pandas as pd
+import pytest
+
+gr = pytest.importorskip("gradio")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture(scope="module")
+def app():
+    # app.py loads its model artifacts relative to src/ when it is imported
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(HERE)
+        import app
+    return app
+
+
+@pytest.fixture(scope="module")
+def baseline(app):
+    # The original pandas/get_dummies preprocessing, on an untouched copy of the model
+    pipeline = joblib.load(os.path.join(HERE, 'models', 'logistic_regression_pipeline.joblib'))
+    encoders = joblib.load(os.path.join(HERE, 'models', 'label_encoders.joblib'))
+
+    def predict(
+        gender, age, status, profession, acad_press, work_press, cgpa, study_sat,
+        job_sat, sleep, diet, suicide, hours, finance_stress, family_hist
+    ):
+        input_data = {
+            'Gender': gender,
+            'Age': age,
+            'Working Professional or Student': status,
+            'Profession': profession if status == 'Working Professional' else 'Student',
+            'Academic Pressure': acad_press if status == 'Student' else 0,
+            'Work Pressure': work_press if status == 'Working Professional' else 0,
+            'CGPA': cgpa if status == 'Student' else 0,
+            'Study Satisfaction': study_sat if status == 'Student' else 0,
+            'Job Satisfaction': job_sat if status == 'Working Professional' else 0,
+            'Sleep Duration': sleep,
+            'Dietary Habits': diet,
+            'Have you ever had suicidal thoughts ?': suicide,
+            'Work/Study Hours': hours,
+            'Financial Stress': finance_stress,
+            'Family History of Mental Illness': family_hist
+        }
+        df_input = pd.DataFrame([input_data])
+        for col in ['Gender', 'Have you ever had suicidal thoughts ?', 'Family History of Mental Illness']:
+            df_input[col] = encoders[col].transform(df_input[col].astype(str))
+        df_encoded = pd.get_dummies(df_input)
+        for col in app.feature_names:
+            if col not in df_encoded.columns:
+                df_encoded[col] = 0
+        df_final = df_encoded[app.feature_names]
+        return pipeline.predict_proba(df_final)[0][1], pipeline.predict(df_final)[0]
+
+    return predict
+
+
+def submissions(app, n=300, seed=0):
+    # Random form submissions as (UI arguments, baseline model inputs) pairs
+    rng = random.Random(seed)
+    professions = [c[len('Profession_'):] for c in app.feature_names if c.startswith('Profession_')]
+    professions.append('Astronaut')
+
+    def label(mapping):
+        text = rng.choice(list(mapping))
+        return text, mapping[text]
+
+    for _ in range(n):
+        gender = rng.choice(['Male', 'Female'])
+        age = rng.randint(18, 65)
+        status = rng.choice(['Student', 'Working Professional'])
+        profession = rng.choice(professions)
+        acad_label, acad_press = label(app.pressure_map)
+        work_label, work_press = label(app.pressure_map)
+        cgpa = rng.choice([None, 0, 5.5, 7.25, 9.1])
+        study_label, study_sat = label(app.satisfaction_map)
+        job_label, job_sat = label(app.satisfaction_map)
+        sleep = rng.choice(["Less than 5 hours", "5-6 hours", "7-8 hours", "More than 8 hours"])
+        diet = rng.choice(["Healthy", "Moderate", "Unhealthy"])
+        suicide = rng.choice(['No', 'Yes'])
+        hours = rng.randint(0, 15)
+        finance_label, finance_stress = label(app.financial_stress_map)
+        family_hist = rng.choice(['No', 'Yes'])
+        yield (
+            ("Name", "0000", gender, age, status, profession, acad_label, work_label, cgpa,
+             study_label, job_label, sleep, diet, suicide, hours, finance_label, family_hist),
+            (gender, age, status, profession, acad_press, work_press, cgpa, study_sat,
+             job_sat, sleep, diet, suicide, hours, finance_stress, family_hist),
+        )
+
+
+def test_matches_baseline_preprocessing(app, baseline):
+    cases = list(submissions(app))
+
+    async def submit_in_turn():
+        return [await app.predict_depression(*args) for args, _ in cases]
+
+    for (status_text, _, prob_text, _), (_, inputs) in zip(asyncio.run(submit_in_turn()), cases):
+        prob, prediction = baseline(*inputs)
+        assert status_text == ("Positive" if prediction == 1 else "Negative")
+        assert float(prob_text.rstrip('%')) == pytest.approx(prob * 100, abs=0.006)
+
+
+def student(cgpa):
+    return (
+        "Name", "0000", "Male", 21, "Student", "", "3 = High", None, cgpa,
+        "2 = Neutral", None, "7-8 hours", "Moderate", "No", 6, "2 = Low", "No"
+    )
+
+
+def test_bad_row_fails_alone_in_a_batch(app, monkeypatch):
+    batch_sizes = []
+    score = app._score
+
+    def spy(X):
+        batch_sizes.append(len(X))
+        return score(X)
+
+    monkeypatch.setattr(app, "_score", spy)
+    app._result_cache.clear()
+
+    async def submit_together():
+        good = [app.predict_depression(*student(5.0 + i / 10)) for i in range(5)]
+        bad = app.predict_depression(*student(math.nan))
+        return await asyncio.gather(*good, bad, return_exceptions=True)
+
+    results = asyncio.run(submit_together())
+
+    assert batch_sizes == [5]
+    for result in results[:5]:
+        assert len(result) == 4 and result[2].endswith("%")
+    assert isinstance(results[5], gr.Error)